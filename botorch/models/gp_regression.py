@@ -178,6 +178,7 @@ class FixedNoiseGP(BatchedMultiOutputGPyTorchModel, ExactGP):
         X: Tensor,
         sampler: MCSampler,
         observation_noise: bool = True,
+        propagate_grads: bool = False,
         **kwargs: Any,
     ) -> "FixedNoiseGP":
         r"""Construct a fantasy model.
@@ -199,12 +200,19 @@ class FixedNoiseGP(BatchedMultiOutputGPyTorchModel, ExactGP):
             observation_noise: If True, include the mean across the observation
                 noise in the training data as observation noise in the posterior
                 from which the samples are drawn.
+            propagate_grads: If True, propagate gradients through the fantasy
+                observations (see `Model.fantasize`). Defaults to `False`.
 
         Returns:
             The constructed fantasy model.
         """
-        post_X = self.posterior(X, observation_noise=observation_noise, **kwargs)
-        Y_fantasized = sampler(post_X)  # num_fantasies x batch_shape x m x o
+        Y_fantasized = self._sample_fantasies(
+            X=X,
+            sampler=sampler,
+            observation_noise=observation_noise,
+            propagate_grads=propagate_grads,
+            **kwargs,
+        )  # num_fantasies x batch_shape x m x o
         # Use the mean of the previous noise values (TODO: be smarter here).
         # noise should be batch_shape x q x o when X is batch_shape x q x d, and
         # Y_fantasized is num_fantasies x batch_shape x q x o.
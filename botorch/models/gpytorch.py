@@ -16,12 +16,162 @@ from typing import Any, List, Optional, Tuple
 import torch
 from gpytorch import settings
 from gpytorch.distributions import MultitaskMultivariateNormal, MultivariateNormal
-from gpytorch.lazy import lazify
+from gpytorch.kernels import Kernel
+from gpytorch.lazy import (
+    BatchRepeatLazyTensor,
+    CholLazyTensor,
+    LazyEvaluatedKernelTensor,
+    NonLazyTensor,
+    RootLazyTensor,
+    delazify,
+    lazify,
+)
+from gpytorch.models.exact_gp import ExactGP
+from gpytorch.models.exact_prediction_strategies import (
+    DefaultPredictionStrategy,
+    prediction_strategy,
+)
+from gpytorch.utils.cholesky import psd_safe_cholesky
+from gpytorch.utils.memoize import add_to_cache
 from torch import Tensor
 
 from ..posteriors.gpytorch import GPyTorchPosterior
 from .model import Model
-from .utils import _make_X_full, add_output_dim, multioutput_to_batch_mode_transform
+from .utils import (
+    _chol_solve,
+    _make_X_full,
+    add_output_dim,
+    multioutput_to_batch_mode_transform,
+)
+
+
+class _BlockCholeskyPredictionStrategy(DefaultPredictionStrategy):
+    r"""Prediction strategy that extends the Cholesky factor in fantasy updates.
+
+    Requires the root decomposition of the train-train covariance to be its
+    Cholesky factor `L` and the covariance cache to be `L^{-T}` (as set up by
+    `GPyTorchModel._init_prediction_strategy`). For `m` new observations, the
+    Cholesky factor of the augmented covariance is obtained without
+    re-factorizing it as
+
+        [K U; U' S] = [L 0; A B] [L' A'; 0 B'],
+
+    where `A = U' L^{-T}` and `B = chol(S - A A')`. Both the new factor and its
+    inverse are block triangular, so the mean and covariance caches of the
+    fantasy strategy are updated in `O(n^2 m + m^3)`. This invariant carries
+    over to the fantasy strategy.
+    """
+
+    def get_fantasy_strategy(
+        self,
+        inputs: List[Tensor],
+        targets: Tensor,
+        full_inputs: List[Tensor],
+        full_targets: Tensor,
+        full_output: MultivariateNormal,
+        **kwargs: Any,
+    ) -> "_BlockCholeskyPredictionStrategy":
+        r"""Construct the prediction strategy of the fantasy model.
+
+        Replaces GPyTorch's update of the covariance cache, which computes a QR
+        decomposition of the full `(n + m) x (n + m)` root, with the block update
+        described above. Arguments and return value are the same as for
+        `DefaultPredictionStrategy.get_fantasy_strategy`.
+
+        Args:
+            inputs: A list of `(f) x batch_shape x m x d`-dim Tensors of fantasy
+                inputs.
+            targets: A `(f) x batch_shape x m`-dim Tensor of fantasy targets.
+            full_inputs: A list of `(f) x batch_shape x (n + m) x d`-dim Tensors
+                of the training inputs concatenated with the fantasy inputs.
+            full_targets: A `(f) x batch_shape x (n + m)`-dim Tensor of the
+                training targets concatenated with the fantasy targets.
+            full_output: The prior distribution at `full_inputs`.
+            kwargs: Passed to the likelihood (e.g. `noise` for fixed noise
+                likelihoods).
+
+        Returns:
+            The prediction strategy of the fantasy model, for which all test-time
+            caches have been updated.
+        """
+        full_mean, full_covar = full_output.mean, full_output.lazy_covariance_matrix
+        batch_shape = full_inputs[0].shape[:-2]
+        full_mean = full_mean.view(*batch_shape, -1)
+        num_train = self.num_train
+
+        # evaluate fant x train and fant x fant covariances, including the noise
+        fant_fant_covar = full_covar[..., num_train:, num_train:]
+        fant_mean = full_mean[..., num_train:]
+        mvn = self.train_prior_dist.__class__(fant_mean, fant_fant_covar)
+        fant_likelihood = self.likelihood.get_fantasy_likelihood(**kwargs)
+        mvn_obs = fant_likelihood(mvn, inputs, **kwargs)
+        fant_fant_covar = mvn_obs.covariance_matrix
+        fant_train_covar = delazify(full_covar[..., num_train:, :num_train])
+
+        self.fantasy_inputs = inputs
+        self.fantasy_targets = targets
+
+        # extend the Cholesky factor: A = U' L^{-T}, B = chol(S - A A')
+        L = delazify(self.lik_train_train_covar.root_decomposition().root)
+        L_inv_t = self.covar_cache
+        A = fant_train_covar.matmul(L_inv_t)
+        B = psd_safe_cholesky(fant_fant_covar - A.matmul(A.transpose(-1, -2)))
+
+        # new mean cache: solve [K U; U' S] [a; b] = [y; y_f] via the Schur
+        # complement S - U' K^{-1} U = B B'
+        mean_cache = self.mean_cache.unsqueeze(-1)
+        rhs = (targets - fant_mean).unsqueeze(-1) - fant_train_covar.matmul(mean_cache)
+        fant_cache_lower = _chol_solve(B, rhs)
+        fant_cache_upper = mean_cache - L_inv_t.matmul(
+            A.transpose(-1, -2).matmul(fant_cache_lower)
+        )
+        fant_mean_cache = torch.cat(
+            [fant_cache_upper.squeeze(-1), fant_cache_lower.squeeze(-1)], dim=-1
+        )
+
+        # new root Z = [L 0; A B] and covariance cache
+        # Z^{-T} = [L^{-T} -L^{-T} A' B^{-T}; 0 B^{-T}]
+        eye = torch.eye(B.size(-1), dtype=B.dtype, device=B.device)
+        B_inv_t = torch.triangular_solve(eye.expand_as(B), B, upper=False)[0]
+        B_inv_t = B_inv_t.transpose(-1, -2)
+        root_batch_shape = fant_train_covar.shape[:-2]
+        n, m = num_train, B.size(-1)
+        tkwargs = {"dtype": L.dtype, "device": L.device}
+        new_root = torch.zeros(*root_batch_shape, n + m, n + m, **tkwargs)
+        new_root[..., :n, :n] = L
+        new_root[..., n:, :n] = A
+        new_root[..., n:, n:] = B
+        new_covar_cache = torch.zeros(*root_batch_shape, n + m, n + m, **tkwargs)
+        new_covar_cache[..., :n, :n] = L_inv_t
+        new_covar_cache[..., :n, n:] = -L_inv_t.matmul(
+            A.transpose(-1, -2).matmul(B_inv_t)
+        )
+        new_covar_cache[..., n:, n:] = B_inv_t
+
+        # expand inputs accordingly if necessary (for fantasies at the same points)
+        if full_inputs[0].dim() <= full_targets.dim():
+            fant_batch_shape = full_targets.shape[:1]
+            n_batch = len(full_mean.shape[:-1])
+            repeat_shape = fant_batch_shape + torch.Size([1] * n_batch)
+            full_inputs = [fi.expand(fant_batch_shape + fi.shape) for fi in full_inputs]
+            full_mean = full_mean.expand(fant_batch_shape + full_mean.shape)
+            full_covar = BatchRepeatLazyTensor(full_covar, repeat_shape)
+            new_root = BatchRepeatLazyTensor(NonLazyTensor(new_root), repeat_shape)
+            # no need to repeat the covar cache, broadcasting will do the right thing
+
+        fant_strat = self.__class__(
+            train_inputs=full_inputs,
+            train_prior_dist=self.train_prior_dist.__class__(full_mean, full_covar),
+            train_labels=full_targets,
+            likelihood=fant_likelihood,
+            root=new_root,
+            inv_root=new_covar_cache,
+        )
+        fant_strat._memoize_cache = {
+            "mean_cache": fant_mean_cache,
+            "covar_cache": new_covar_cache,
+        }
+        return fant_strat
 
 
 class GPyTorchModel(Model, ABC):
@@ -31,6 +181,81 @@ class GPyTorchModel(Model, ABC):
     class (e.g. an `ExactGP`) and this `GPyTorchModel`. See e.g. `SingleTaskGP`.
     """
 
+    def _init_prediction_strategy(self) -> None:
+        r"""Construct GPyTorch's prediction strategy from a single factorization.
+
+        GPyTorch computes the mean cache on a freshly constructed train-train
+        covariance, so its Cholesky factor is not shared with the (cached) one of
+        the covariance used for the covariance cache and the fantasy updates in
+        `condition_on_observations`. Its covariance cache is furthermore based on
+        an explicit inverse of that Cholesky factor. This sets up the prediction
+        strategy ahead of the first evaluation and computes both the mean cache
+        and the inverse root of the strategy's own train-train covariance using
+        triangular solves against its cached Cholesky factor, so that `posterior`
+        and `fantasize` factorize `K_XX + sigma^2 I` only once.
+
+        This only applies if GPyTorch would use a Cholesky decomposition for the
+        train-train covariance (i.e. if `n <= max_cholesky_size` or if fast
+        computations are turned off). Otherwise, or if the model is not an
+        `ExactGP`, is evaluated in prior mode or has no training data, or if
+        GPyTorch uses a specialized prediction strategy (e.g. for KISS-GP), the
+        caches are left to GPyTorch.
+        """
+        if not isinstance(self, ExactGP) or self.prediction_strategy is not None:
+            return
+        if (
+            settings.prior_mode.on()
+            or self.train_inputs is None
+            or self.train_targets is None
+        ):
+            return
+        train_inputs = list(self.train_inputs)
+        train_prior_dist = super(ExactGP, self).__call__(*train_inputs)
+        strategy_kwargs = {
+            "train_inputs": train_inputs,
+            "train_prior_dist": train_prior_dist,
+            "train_labels": self.train_targets,
+            "likelihood": self.likelihood,
+        }
+        # GPyTorch dispatches on the kernel, whose `prediction_strategy` method
+        # constructs a `DefaultPredictionStrategy` unless it is overridden
+        train_train_covar = train_prior_dist.lazy_covariance_matrix
+        if isinstance(train_train_covar, LazyEvaluatedKernelTensor):
+            kernel_cls = type(train_train_covar.kernel)
+            if kernel_cls.prediction_strategy is not Kernel.prediction_strategy:
+                self.prediction_strategy = prediction_strategy(**strategy_kwargs)
+                return
+        use_cholesky = train_train_covar.size(-1) <= settings.max_cholesky_size.value()
+        use_chol_root = (
+            use_cholesky or settings.fast_computations.covar_root_decomposition.off()
+        )
+        if use_chol_root:
+            # fantasy updates can extend the Cholesky factor block-wise
+            strategy = _BlockCholeskyPredictionStrategy(**strategy_kwargs)
+        else:
+            strategy = DefaultPredictionStrategy(**strategy_kwargs)
+        self.prediction_strategy = strategy
+        train_train_covar = strategy.lik_train_train_covar
+        if use_cholesky or settings.fast_computations.solves.off():
+            # the Cholesky factor is cached on `train_train_covar`
+            L = delazify(train_train_covar.cholesky())
+            train_labels_offset = strategy.train_labels - train_prior_dist.loc
+            mean_cache = _chol_solve(L, train_labels_offset.unsqueeze(-1)).squeeze(-1)
+            if settings.detach_test_caches.on():
+                mean_cache = mean_cache.detach()
+            add_to_cache(strategy, "mean_cache", mean_cache)
+        if use_chol_root:
+            L = train_train_covar.cholesky()
+            add_to_cache(train_train_covar, "root_decomposition", CholLazyTensor(L))
+            L = delazify(L)
+            eye = torch.eye(L.size(-1), dtype=L.dtype, device=L.device)
+            L_inv = torch.triangular_solve(eye.expand_as(L), L, upper=False)[0]
+            add_to_cache(
+                train_train_covar,
+                "root_inv_decomposition",
+                RootLazyTensor(lazify(L_inv.transpose(-1, -2))),
+            )
+
     def posterior(
         self, X: Tensor, observation_noise: bool = False, **kwargs: Any
     ) -> GPyTorchPosterior:
@@ -56,6 +281,7 @@ class GPyTorchModel(Model, ABC):
             es.enter_context(settings.debug(False))
             es.enter_context(settings.fast_pred_var())
             es.enter_context(settings.detach_test_caches(detach_test_caches))
+            self._init_prediction_strategy()
             mvn = self(X)
             if observation_noise:
                 # TODO: Allow passing in observation noise via kwarg
@@ -65,6 +291,12 @@ class GPyTorchModel(Model, ABC):
     def condition_on_observations(self, X: Tensor, Y: Tensor, **kwargs: Any) -> "Model":
         r"""Condition the model on new observations.
 
+        If `posterior` factorized the train-train covariance via Cholesky (see
+        `_init_prediction_strategy`), its Cholesky factor is extended block-wise
+        rather than re-factorizing the `(n + m) x (n + m)` covariance, at a cost
+        of `O(n^2 m + m^3)` for `m` new observations. Otherwise, GPyTorch's
+        (Lanczos-based) fantasy update is used.
+
         Args:
             X: A `batch_shape x n x d`-dim Tensor, where `d` is the dimension of
                 the feature space, `n` is the number of points per batch, and
@@ -179,6 +411,7 @@ class BatchedMultiOutputGPyTorchModel(GPyTorchModel):
             es.enter_context(settings.debug(False))
             es.enter_context(settings.fast_pred_var())
             es.enter_context(settings.detach_test_caches(detach_test_caches))
+            self._init_prediction_strategy()
             # insert a dimension for the output dimension
             if self._num_outputs > 1:
                 X, output_dim_idx = add_output_dim(
@@ -382,6 +615,7 @@ class MultiTaskGPyTorchModel(GPyTorchModel, ABC):
             es.enter_context(settings.debug(False))
             es.enter_context(settings.fast_pred_var())
             es.enter_context(settings.detach_test_caches(detach_test_caches))
+            self._init_prediction_strategy()
             mvn = self(X_full)
             if observation_noise:
                 # TODO: Allow passing in observation noise via kwarg
@@ -7,13 +7,17 @@ Abstract base module for all BoTorch models.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, Any, List, Optional
 
+import torch
 from torch import Tensor
 from torch.nn import Module
 
-from ..posteriors import Posterior
-from ..sampling.samplers import MCSampler
+
+if TYPE_CHECKING:
+    from ..posteriors import Posterior
+    from ..sampling.samplers import MCSampler
 
 
 class Model(Module, ABC):
@@ -26,7 +30,7 @@ class Model(Module, ABC):
         output_indices: Optional[List[int]] = None,
         observation_noise: bool = False,
         **kwargs: Any,
-    ) -> Posterior:
+    ) -> "Posterior":
         r"""Computes the posterior over model outputs at the provided points.
 
         Args:
@@ -72,8 +76,9 @@ class Model(Module, ABC):
     def fantasize(
         self,
         X: Tensor,
-        sampler: MCSampler,
+        sampler: "MCSampler",
         observation_noise: bool = True,
+        propagate_grads: bool = False,
         **kwargs: Any,
     ) -> "Model":
         r"""Construct a fantasy model.
@@ -85,6 +90,10 @@ class Model(Module, ABC):
         observations.
         (3) condition the model on the new fake observations.
 
+        Since `X` does not have a fantasy batch dimension, models may compute the
+        updated test caches once and share them across all fantasies (as GPyTorch
+        models do in `get_fantasy_model`).
+
         Args:
             X: A `batch_shape x m x d`-dim Tensor, where `d` is the dimension of
                 the feature space, `m` is the number of points per batch, and
@@ -92,10 +101,53 @@ class Model(Module, ABC):
                 batch shape of the model).
             sampler: The sampler used for sampling from the posterior at `X`.
             observation_noise: If True, include observation noise.
+            propagate_grads: If True, do not detach the test caches and build the
+                autograd graph when sampling the fantasies, so that derivatives can
+                be propagated through the fantasy observations (e.g. w.r.t. `X`).
+                If False, the posterior is computed and sampled under
+                `torch.no_grad()`, so the fantasy observations are not
+                differentiable w.r.t. `X` (gradients only flow through the
+                fantasy model's training inputs). Defaults to `False`.
 
         Returns:
             The constructed fantasy model.
         """
-        post_X = self.posterior(X, observation_noise=observation_noise, **kwargs)
-        Y_fantasized = sampler(post_X)  # num_fantasies x batch_shape x m x o
+        Y_fantasized = self._sample_fantasies(
+            X=X,
+            sampler=sampler,
+            observation_noise=observation_noise,
+            propagate_grads=propagate_grads,
+            **kwargs,
+        )  # num_fantasies x batch_shape x m x o
         return self.condition_on_observations(X=X, Y=Y_fantasized, **kwargs)
+
+    def _sample_fantasies(
+        self,
+        X: Tensor,
+        sampler: "MCSampler",
+        observation_noise: bool,
+        propagate_grads: bool,
+        **kwargs: Any,
+    ) -> Tensor:
+        r"""Sample fantasy observations from the posterior at `X`.
+
+        Args:
+            X: A `batch_shape x m x d`-dim Tensor of fantasy points.
+            sampler: The sampler used for sampling from the posterior at `X`.
+            observation_noise: If True, include observation noise.
+            propagate_grads: If True, pass `propagate_grads=True` to `posterior`
+                and sample with gradients. Otherwise, sample under
+                `torch.no_grad()`.
+
+        Returns:
+            A `num_fantasies x batch_shape x m x o`-dim Tensor of fantasy
+            observations.
+        """
+        # only pass `propagate_grads` if set, `posterior` need not accept kwargs
+        if propagate_grads:
+            kwargs = dict(kwargs, propagate_grads=True)
+        with ExitStack() as es:
+            if not propagate_grads:
+                es.enter_context(torch.no_grad())
+            post_X = self.posterior(X, observation_noise=observation_noise, **kwargs)
+            return sampler(post_X)
@@ -25,7 +25,10 @@ class ModelListGP(IndependentModelList, ModelListGPyTorchModel):
     very flexible and convenient to work with. The sequential evaluation comes
     at a performance cost though - if you are using a block design (i.e. the
     same number of training example for each output, and a similar model
-    structure, you should consider using a batched GP model instead).
+    structure), you should consider using a batched GP model instead, which
+    evaluates, samples and fantasizes all outputs in a single batched call. A
+    compatible `ModelListGP` can be converted using `model_list_to_batched`
+    from `botorch.models.converter`.
     """
 
     def __init__(self, *gp_models: GPyTorchModel) -> None:
@@ -36,6 +36,23 @@ def _make_X_full(X: Tensor, output_indices: List[int], tf: int) -> Tensor:
     )
 
 
+def _chol_solve(L: Tensor, rhs: Tensor) -> Tensor:
+    r"""Solve the linear system `L L^T x = rhs` using the Cholesky factor `L`.
+
+    The solve is performed via two triangular solves (avoiding any explicit
+    inverse). Contrary to `torch.cholesky_solve`, this supports autograd.
+
+    Args:
+        L: A `batch_shape x n x n` lower triangular Cholesky factor.
+        rhs: A `batch_shape x n x k` tensor of right hand sides.
+
+    Returns:
+        A `batch_shape x n x k` tensor `x` solving `L L^T x = rhs`.
+    """
+    res = torch.triangular_solve(rhs, L, upper=False)[0]
+    return torch.triangular_solve(res, L.transpose(-1, -2), upper=True)[0]
+
+
 def multioutput_to_batch_mode_transform(
     train_X: Tensor,
     train_Y: Tensor,
@@ -2,6 +2,7 @@
 
 # Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
 
+import torch
 from torch import Tensor
 
 
@@ -9,7 +10,23 @@ GLOBAL_MAXIMIZER = [1.0]
 GLOBAL_MAXIMUM = 0.0
 
 
-def neg_aug_rosenbrock(X: Tensor):
+@torch.jit.script
+def _neg_aug_rosenbrock(X: Tensor) -> Tensor:
+    # TorchScript-compiled implementation of `neg_aug_rosenbrock`
+    batch = X.dim() > 1
+    X = X if batch else X.unsqueeze(0)
+    X_curr = X[..., :-3]
+    X_next = X[..., 1:-2]
+    result = (
+        -(
+            100 * (X_next - X_curr ** 2 + 0.1 * (1 - X[..., -2].unsqueeze(-1))) ** 2
+            + (X_curr - 1 + 0.1 * (1 - X[..., -1].unsqueeze(-1)) ** 2) ** 2
+        )
+    ).sum(dim=-1)
+    return result if batch else result.squeeze(0)
+
+
+def neg_aug_rosenbrock(X: Tensor) -> Tensor:
     r"""Augmented-Rosenbrock test function.
 
     d-dimensional function (usually evaluated on `[-5, 10]^(d-2) * [0, 1]^2`),
@@ -30,14 +47,4 @@ def neg_aug_rosenbrock(X: Tensor):
     Returns:
         `-f(X)`, the negative value of the Augmented-Rosenbrock function.
     """
-    batch = X.ndimension() > 1
-    X = X if batch else X.unsqueeze(0)
-    X_curr = X[..., :-3]
-    X_next = X[..., 1:-2]
-    result = (
-        -(
-            100 * (X_next - X_curr ** 2 + 0.1 * (1 - X[..., -2].unsqueeze(-1))) ** 2
-            + (X_curr - 1 + 0.1 * (1 - X[..., -1].unsqueeze(-1)) ** 2) ** 2
-        )
-    ).sum(dim=-1)
-    return result if batch else result.squeeze(0)
+    return _neg_aug_rosenbrock(X)
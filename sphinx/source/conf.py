@@ -80,6 +80,10 @@ autodoc_default_options = {}
 # Inlcude init docstrings into body of autoclass directives
 autoclass_content = "both"
 
+# Evaluate `if TYPE_CHECKING:` imports so that sphinx_autodoc_typehints can
+# resolve forward references in type annotations
+set_type_checking_flag = True
+
 
 # -- Options for HTML output -------------------------------------------------
 
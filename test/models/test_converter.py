@@ -3,6 +3,7 @@
 # Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
 
 import unittest
+from copy import deepcopy
 
 import torch
 from botorch.exceptions import UnsupportedError
@@ -13,31 +14,46 @@ from botorch.models import (
     SingleTaskGP,
 )
 from botorch.models.converter import batched_to_model_list, model_list_to_batched
+from botorch.utils import manual_seed
 from gpytorch.likelihoods import GaussianLikelihood
 
 from .test_gpytorch import SimpleGPyTorchModel
 
 
 class TestConverters(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        devices = [torch.device("cpu")]
+        if torch.cuda.is_available():
+            devices.append(torch.device("cuda"))
+        cls._train_data = {}
+        cls._noise = {}
+        with manual_seed(0):
+            for device in devices:
+                for dtype in (torch.float, torch.double):
+                    train_X = torch.rand(10, 2, device=device, dtype=dtype)
+                    # outputs are `x_1 + x_2` and `x_1 - x_2`
+                    train_Y = train_X @ torch.tensor(
+                        [[1.0, 1.0], [1.0, -1.0]], device=device, dtype=dtype
+                    )
+                    cls._train_data[(device, dtype)] = (train_X, train_Y)
+                    cls._noise[(device, dtype)] = torch.full_like(train_Y, 0.1)
+
     def test_batched_to_model_list(self, cuda=False):
         device = torch.device("cuda") if cuda else torch.device("cpu")
         for dtype in (torch.float, torch.double):
             # test SingleTaskGP
-            train_X = torch.rand(10, 2, device=device, dtype=dtype)
-            train_Y1 = train_X.sum(dim=-1)
-            train_Y2 = train_X[:, 0] - train_X[:, 1]
-            train_Y = torch.stack([train_Y1, train_Y2], dim=-1)
+            train_X, train_Y = self._train_data[(device, dtype)]
+            train_Yvar = self._noise[(device, dtype)]
             batch_gp = SingleTaskGP(train_X, train_Y)
             list_gp = batched_to_model_list(batch_gp)
             self.assertIsInstance(list_gp, ModelListGP)
             # test FixedNoiseGP
-            batch_gp = FixedNoiseGP(train_X, train_Y, torch.rand_like(train_Y))
+            batch_gp = FixedNoiseGP(train_X, train_Y, train_Yvar)
             list_gp = batched_to_model_list(batch_gp)
             self.assertIsInstance(list_gp, ModelListGP)
             # test HeteroskedasticSingleTaskGP
-            batch_gp = HeteroskedasticSingleTaskGP(
-                train_X, train_Y, torch.rand_like(train_Y)
-            )
+            batch_gp = HeteroskedasticSingleTaskGP(train_X, train_Y, train_Yvar)
             with self.assertRaises(NotImplementedError):
                 batched_to_model_list(batch_gp)
 
@@ -45,15 +61,18 @@ class TestConverters(unittest.TestCase):
         if torch.cuda.is_available():
             self.test_batched_to_model_list(cuda=True)
 
+    def _make_base_gps(self, device, dtype):
+        train_X, train_Y = self._train_data[(device, dtype)]
+        gp1 = SingleTaskGP(train_X, train_Y[:, 0])
+        gp2 = SingleTaskGP(train_X, train_Y[:, 1])
+        return train_X, gp1, gp2
+
     def test_model_list_to_batched(self, cuda=False):
         device = torch.device("cuda") if cuda else torch.device("cpu")
         for dtype in (torch.float, torch.double):
             # basic test
-            train_X = torch.rand(10, 2, device=device, dtype=dtype)
-            train_Y1 = train_X.sum(dim=-1)
-            train_Y2 = train_X[:, 0] - train_X[:, 1]
-            gp1 = SingleTaskGP(train_X, train_Y1)
-            gp2 = SingleTaskGP(train_X, train_Y2)
+            train_X, gp1, gp2 = self._make_base_gps(device=device, dtype=dtype)
+            train_Y1, train_Y2 = gp1.train_targets, gp2.train_targets
             list_gp = ModelListGP(gp1, gp2)
             batch_gp = model_list_to_batched(list_gp)
             self.assertIsInstance(batch_gp, SingleTaskGP)
@@ -61,9 +80,9 @@ class TestConverters(unittest.TestCase):
             batch_gp = model_list_to_batched(ModelListGP(gp1))
             self.assertEqual(batch_gp._num_outputs, 1)
             # test different model classes
-            gp2 = FixedNoiseGP(train_X, train_Y1, torch.ones_like(train_Y1))
+            gp2_ = FixedNoiseGP(train_X, train_Y1, torch.ones_like(train_Y1))
             with self.assertRaises(UnsupportedError):
-                model_list_to_batched(ModelListGP(gp1, gp2))
+                model_list_to_batched(ModelListGP(gp1, gp2_))
             # test non-batched models
             gp1_ = SimpleGPyTorchModel(train_X, train_Y1)
             gp2_ = SimpleGPyTorchModel(train_X, train_Y2)
@@ -71,41 +90,40 @@ class TestConverters(unittest.TestCase):
                 model_list_to_batched(ModelListGP(gp1_, gp2_))
             # test list of multi-output models
             train_Y = torch.stack([train_Y1, train_Y2], dim=-1)
-            gp2 = SingleTaskGP(train_X, train_Y)
+            gp2_ = SingleTaskGP(train_X, train_Y)
             with self.assertRaises(UnsupportedError):
-                model_list_to_batched(ModelListGP(gp1, gp2))
+                model_list_to_batched(ModelListGP(gp1, gp2_))
             # test different training inputs
-            gp2 = SingleTaskGP(2 * train_X, train_Y2)
+            gp2_ = deepcopy(gp2)
+            gp2_.set_train_data(inputs=2 * train_X, strict=False)
             with self.assertRaises(UnsupportedError):
-                model_list_to_batched(ModelListGP(gp1, gp2))
+                model_list_to_batched(ModelListGP(gp1, gp2_))
             # check scalar agreement
-            gp2 = SingleTaskGP(train_X, train_Y2)
-            gp2.likelihood.noise_covar.noise_prior.rate.fill_(1.0)
+            gp2_ = deepcopy(gp2)
+            gp2_.likelihood.noise_covar.noise_prior.rate.fill_(1.0)
             with self.assertRaises(UnsupportedError):
-                model_list_to_batched(ModelListGP(gp1, gp2))
+                model_list_to_batched(ModelListGP(gp1, gp2_))
             # check tensor shape agreement
-            gp2 = SingleTaskGP(train_X, train_Y2)
-            gp2.covar_module.raw_outputscale = torch.nn.Parameter(
+            gp2_ = deepcopy(gp2)
+            gp2_.covar_module.raw_outputscale = torch.nn.Parameter(
                 torch.tensor([0.0], device=device, dtype=dtype)
             )
             with self.assertRaises(UnsupportedError):
-                model_list_to_batched(ModelListGP(gp1, gp2))
+                model_list_to_batched(ModelListGP(gp1, gp2_))
             # test HeteroskedasticSingleTaskGP
-            gp2 = HeteroskedasticSingleTaskGP(
+            gp2_ = HeteroskedasticSingleTaskGP(
                 train_X, train_Y1, torch.ones_like(train_Y1)
             )
             with self.assertRaises(NotImplementedError):
-                model_list_to_batched(ModelListGP(gp2))
+                model_list_to_batched(ModelListGP(gp2_))
             # test custom likelihood
-            gp2 = SingleTaskGP(train_X, train_Y2, likelihood=GaussianLikelihood())
+            gp2_ = SingleTaskGP(train_X, train_Y2, likelihood=GaussianLikelihood())
             with self.assertRaises(NotImplementedError):
-                model_list_to_batched(ModelListGP(gp2))
+                model_list_to_batched(ModelListGP(gp2_))
             # test FixedNoiseGP
-            train_X = torch.rand(10, 2, device=device, dtype=dtype)
-            train_Y1 = train_X.sum(dim=-1)
-            train_Y2 = train_X[:, 0] - train_X[:, 1]
-            gp1_ = FixedNoiseGP(train_X, train_Y1, torch.rand_like(train_Y1))
-            gp2_ = FixedNoiseGP(train_X, train_Y2, torch.rand_like(train_Y2))
+            train_Yvar = self._noise[(device, dtype)]
+            gp1_ = FixedNoiseGP(train_X, train_Y1, train_Yvar[:, 0])
+            gp2_ = FixedNoiseGP(train_X, train_Y2, train_Yvar[:, 1])
             list_gp = ModelListGP(gp1_, gp2_)
             batch_gp = model_list_to_batched(list_gp)
 
@@ -116,10 +134,8 @@ class TestConverters(unittest.TestCase):
     def test_roundtrip(self, cuda=False):
         device = torch.device("cuda") if cuda else torch.device("cpu")
         for dtype in (torch.float, torch.double):
-            train_X = torch.rand(10, 2, device=device, dtype=dtype)
-            train_Y1 = train_X.sum(dim=-1)
-            train_Y2 = train_X[:, 0] - train_X[:, 1]
-            train_Y = torch.stack([train_Y1, train_Y2], dim=-1)
+            train_X, train_Y = self._train_data[(device, dtype)]
+            train_Yvar = self._noise[(device, dtype)]
             # SingleTaskGP
             batch_gp = SingleTaskGP(train_X, train_Y)
             list_gp = batched_to_model_list(batch_gp)
@@ -127,15 +143,29 @@ class TestConverters(unittest.TestCase):
             sd_orig = batch_gp.state_dict()
             sd_recov = batch_gp_recov.state_dict()
             self.assertTrue(set(sd_orig) == set(sd_recov))
-            self.assertTrue(all(torch.equal(sd_orig[k], sd_recov[k]) for k in sd_orig))
+            keys = sorted(sd_orig)
+            self.assertTrue(all(sd_orig[k].shape == sd_recov[k].shape for k in keys))
+            self.assertTrue(
+                torch.equal(
+                    torch.cat([sd_orig[k].view(-1) for k in keys]),
+                    torch.cat([sd_recov[k].view(-1) for k in keys]),
+                )
+            )
             # FixedNoiseGP
-            batch_gp = FixedNoiseGP(train_X, train_Y, torch.rand_like(train_Y))
+            batch_gp = FixedNoiseGP(train_X, train_Y, train_Yvar)
             list_gp = batched_to_model_list(batch_gp)
             batch_gp_recov = model_list_to_batched(list_gp)
             sd_orig = batch_gp.state_dict()
             sd_recov = batch_gp_recov.state_dict()
             self.assertTrue(set(sd_orig) == set(sd_recov))
-            self.assertTrue(all(torch.equal(sd_orig[k], sd_recov[k]) for k in sd_orig))
+            keys = sorted(sd_orig)
+            self.assertTrue(all(sd_orig[k].shape == sd_recov[k].shape for k in keys))
+            self.assertTrue(
+                torch.equal(
+                    torch.cat([sd_orig[k].view(-1) for k in keys]),
+                    torch.cat([sd_recov[k].view(-1) for k in keys]),
+                )
+            )
 
     def test_roundtrip_cuda(self):
         if torch.cuda.is_available():
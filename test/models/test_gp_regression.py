@@ -5,6 +5,8 @@
 import math
 import unittest
 import warnings
+from copy import deepcopy
+from unittest import mock
 
 import torch
 from botorch import fit_gpytorch_model
@@ -26,6 +28,7 @@ from gpytorch.likelihoods import (
 )
 from gpytorch.means import ConstantMean
 from gpytorch.mlls.exact_marginal_log_likelihood import ExactMarginalLogLikelihood
+from gpytorch.models.exact_prediction_strategies import DefaultPredictionStrategy
 from gpytorch.priors import GammaPrior
 
 
@@ -254,10 +257,57 @@ class TestSingleTaskGP(unittest.TestCase):
                     sampler = SobolQMCNormalSampler(num_samples=3)
                     fm = model.fantasize(X=X_f, sampler=sampler)
                     self.assertIsInstance(fm, model.__class__)
+                    # the fantasy update is shared across the fantasy batch
+                    self.assertEqual(fm.train_inputs[0].stride(0), 0)
+                    self.assertEqual(
+                        fm.prediction_strategy.covar_cache.shape[:-2],
+                        model.prediction_strategy.covar_cache.shape[:-2],
+                    )
+                    # compare against GPyTorch's fantasy update (in double
+                    # precision only, since in single precision the fantasy
+                    # samples amplify small differences in the posterior at X_f)
+                    if double:
+                        self._check_fantasy_update(model, fm, X_f, sampler)
                     fm = model.fantasize(
                         X=X_f, sampler=sampler, observation_noise=False
                     )
                     self.assertIsInstance(fm, model.__class__)
+                    # test propagating gradients through the fantasies
+                    X_f.requires_grad_(True)
+                    fm = model.fantasize(X=X_f, sampler=sampler, propagate_grads=True)
+                    self.assertIsInstance(fm, model.__class__)
+                    grad = torch.autograd.grad(fm.train_targets.sum(), X_f)[0]
+                    self.assertTrue(grad.abs().sum().item() > 0)
+
+    def _check_fantasy_update(self, model, fm, X_f, sampler):
+        # reference fantasy models, using GPyTorch's `DefaultPredictionStrategy`
+        model_ref = deepcopy(model)
+        with mock.patch.object(model_ref, "_init_prediction_strategy"):
+            fm_ref = model_ref.fantasize(X=X_f, sampler=sampler)
+        self.assertIs(type(fm_ref.prediction_strategy), DefaultPredictionStrategy)
+        # fantasies of the fantasy model (with a fantasy batch dimension in X)
+        batch_shape = X_f.shape[:-2]
+        tkwargs = {"device": X_f.device, "dtype": X_f.dtype}
+        X_f2 = torch.rand(
+            torch.Size([2, 3]) + batch_shape + torch.Size([2, 1]), **tkwargs
+        )
+        sampler2 = SobolQMCNormalSampler(num_samples=2)
+        fm2 = fm.fantasize(X=X_f2, sampler=sampler2)
+        fm2_ref = fm_ref.fantasize(X=X_f2, sampler=sampler2)
+        test_X = torch.rand(batch_shape + torch.Size([3, 1]), **tkwargs)
+        for m, m_ref in ((fm, fm_ref), (fm2, fm2_ref)):
+            self.assertTrue(
+                torch.allclose(m.train_targets, m_ref.train_targets, atol=1e-6)
+            )
+            post, post_ref = m.posterior(test_X), m_ref.posterior(test_X)
+            self.assertTrue(torch.allclose(post.mean, post_ref.mean, atol=1e-6))
+            self.assertTrue(
+                torch.allclose(
+                    post.mvn.covariance_matrix,
+                    post_ref.mvn.covariance_matrix,
+                    atol=1e-6,
+                )
+            )
 
     def test_fantasize_cuda(self):
         if torch.cuda.is_available():
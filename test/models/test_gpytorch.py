@@ -3,9 +3,12 @@
 # Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
 
 import unittest
+from unittest import mock
 
 import torch
+from botorch.models import gpytorch as gpytorch_module
 from botorch.models.gpytorch import (
+    _BlockCholeskyPredictionStrategy,
     BatchedMultiOutputGPyTorchModel,
     GPyTorchModel,
     ModelListGPyTorchModel,
@@ -13,11 +16,15 @@ from botorch.models.gpytorch import (
 from botorch.models.utils import multioutput_to_batch_mode_transform
 from botorch.posteriors.gpytorch import GPyTorchPosterior
 from botorch.sampling.samplers import SobolQMCNormalSampler
+from gpytorch import settings
 from gpytorch.distributions import MultivariateNormal
 from gpytorch.kernels import RBFKernel, ScaleKernel
+from gpytorch.lazy import lazy_tensor
 from gpytorch.likelihoods import GaussianLikelihood
 from gpytorch.means import ConstantMean
 from gpytorch.models import ExactGP, IndependentModelList
+from gpytorch.models.exact_prediction_strategies import DefaultPredictionStrategy
+from gpytorch.utils.memoize import add_to_cache
 
 
 class SimpleGPyTorchModel(ExactGP, GPyTorchModel):
@@ -68,6 +75,50 @@ class TestGPyTorchModel(unittest.TestCase):
         posterior = model.posterior(test_X)
         self.assertIsInstance(posterior, GPyTorchPosterior)
         self.assertEqual(posterior.mean.shape, torch.Size([2, 1]))
+        # test that the train-train covariance is factorized only once
+        model = SimpleGPyTorchModel(train_X, train_Y)
+        with mock.patch.object(
+            lazy_tensor, "psd_safe_cholesky", wraps=lazy_tensor.psd_safe_cholesky
+        ) as mock_chol:
+            model.posterior(test_X)
+            self.assertEqual(mock_chol.call_count, 1)
+            model.posterior(test_X)
+            self.assertEqual(mock_chol.call_count, 1)
+        # test that a single strategy of the appropriate type is constructed
+        init = DefaultPredictionStrategy.__init__
+        with mock.patch.object(
+            DefaultPredictionStrategy, "__init__", autospec=True, side_effect=init
+        ) as mock_init:
+            model = SimpleGPyTorchModel(train_X, train_Y)
+            model.posterior(test_X)
+            self.assertEqual(mock_init.call_count, 1)
+            self.assertIsInstance(
+                model.prediction_strategy, _BlockCholeskyPredictionStrategy
+            )
+            model = SimpleGPyTorchModel(train_X, train_Y)
+            with settings.max_cholesky_size(2):
+                model.posterior(test_X)
+            self.assertEqual(mock_init.call_count, 2)
+            self.assertIs(type(model.prediction_strategy), DefaultPredictionStrategy)
+        # test that the inverse root is the one computed via triangular solves
+        model = SimpleGPyTorchModel(train_X, train_Y)
+        with mock.patch(
+            f"{gpytorch_module.__name__}.add_to_cache", wraps=add_to_cache
+        ) as mock_add_to_cache:
+            model.posterior(test_X)
+        seeded = {c[0][1]: c[0][2] for c in mock_add_to_cache.call_args_list}
+        K = model.prediction_strategy.lik_train_train_covar
+        self.assertIs(K.root_inv_decomposition(), seeded["root_inv_decomposition"])
+        # test that the prior is returned if there is no training data
+        model.train_inputs = None
+        model.prediction_strategy = None
+        posterior = model.posterior(test_X)
+        self.assertIsNone(model.prediction_strategy)
+        self.assertEqual(posterior.mean.shape, torch.Size([2, 1]))
+        model = SimpleGPyTorchModel(train_X, train_Y)
+        with settings.prior_mode(True):
+            model.posterior(test_X)
+        self.assertIsNone(model.prediction_strategy)
         # test observation noise
         posterior = model.posterior(test_X, observation_noise=True)
         self.assertIsInstance(posterior, GPyTorchPosterior)
@@ -84,6 +135,33 @@ class TestGPyTorchModel(unittest.TestCase):
         cm = model.fantasize(torch.rand(2, 1), sampler=sampler, observation_noise=True)
         self.assertIsInstance(cm, SimpleGPyTorchModel)
         self.assertEqual(cm.train_targets.shape, torch.Size([2, 7]))
+        # test that conditioning extends the Cholesky factor (without QR of the
+        # full root) and agrees with a model on the full data
+        train_X_d, train_Y_d = train_X.double(), train_Y.double()
+        model_d = SimpleGPyTorchModel(train_X_d, train_Y_d).double()
+        model_d.posterior(test_X.double())
+        X_new, Y_new = torch.rand(2, 1, dtype=torch.double), torch.rand(2).double()
+        with mock.patch("torch.qr", wraps=torch.qr) as mock_qr:
+            cm = model_d.condition_on_observations(X_new, Y_new)
+            posterior = cm.posterior(test_X.double())
+            self.assertEqual(mock_qr.call_count, 0)
+        model_full = SimpleGPyTorchModel(
+            torch.cat([train_X_d, X_new]), torch.cat([train_Y_d, Y_new])
+        ).double()
+        posterior_full = model_full.posterior(test_X.double())
+        self.assertTrue(torch.allclose(posterior.mean, posterior_full.mean))
+        self.assertTrue(
+            torch.allclose(
+                posterior.mvn.covariance_matrix, posterior_full.mvn.covariance_matrix
+            )
+        )
+        # test that fantasies are sampled without gradients unless requested
+        X_f = torch.rand(2, 1, requires_grad=True)
+        cm = model.fantasize(X_f, sampler=sampler)
+        self.assertFalse(cm.train_targets.requires_grad)
+        cm = model.fantasize(X_f, sampler=sampler, propagate_grads=True)
+        grad = torch.autograd.grad(cm.train_targets.sum(), X_f)[0]
+        self.assertTrue(grad.abs().sum().item() > 0)
 
 
 class TestBatchedMultiOutputGPyTorchModel(unittest.TestCase):
@@ -4,7 +4,10 @@
 
 import unittest
 
+import torch
 from botorch.models.model import Model
+from botorch.sampling.samplers import SobolQMCNormalSampler
+from botorch.utils.mock import MockModel, MockPosterior
 
 
 class NotSoAbstractBaseModel(Model):
@@ -21,3 +24,11 @@ class TestBaseModel(unittest.TestCase):
         model = NotSoAbstractBaseModel()
         with self.assertRaises(NotImplementedError):
             model.condition_on_observations(None, None)
+
+    def test_fantasize_posterior_without_kwargs(self):
+        # `fantasize` must not pass `propagate_grads` to `posterior` by default
+        posterior = MockPosterior(samples=torch.rand(2, 1))
+        model = MockModel(posterior)
+        sampler = SobolQMCNormalSampler(num_samples=2)
+        with self.assertRaises(NotImplementedError):
+            model.fantasize(torch.rand(2, 1), sampler=sampler)
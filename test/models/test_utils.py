@@ -5,7 +5,11 @@
 import unittest
 
 import torch
-from botorch.models.utils import add_output_dim, multioutput_to_batch_mode_transform
+from botorch.models.utils import (
+    _chol_solve,
+    add_output_dim,
+    multioutput_to_batch_mode_transform,
+)
 
 
 class TestMultiOutputToBatchModeTransform(unittest.TestCase):
@@ -80,3 +84,26 @@ class TestAddOutputDim(unittest.TestCase):
     def test_add_output_dim_cuda(self, cuda=False):
         if torch.cuda.is_available():
             self.test_add_output_dim(cuda=True)
+
+
+class TestCholSolve(unittest.TestCase):
+    def test_chol_solve(self, cuda=False):
+        for double in (False, True):
+            tkwargs = {
+                "device": torch.device("cuda") if cuda else torch.device("cpu"),
+                "dtype": torch.double if double else torch.float,
+            }
+            A = torch.rand(2, 4, 4, **tkwargs)
+            K = A @ A.transpose(-1, -2) + torch.eye(4, **tkwargs)
+            L = torch.cholesky(K).requires_grad_(True)
+            rhs = torch.rand(2, 4, 3, **tkwargs)
+            res = _chol_solve(L, rhs)
+            self.assertEqual(res.shape, rhs.shape)
+            self.assertTrue(torch.allclose(K @ res, rhs, atol=1e-4))
+            # test that the solve supports autograd
+            res.sum().backward()
+            self.assertIsNotNone(L.grad)
+
+    def test_chol_solve_cuda(self):
+        if torch.cuda.is_available():
+            self.test_chol_solve(cuda=True)
@@ -3,6 +3,7 @@
 # Copyright (c) Facebook, Inc. and its affiliates. All Rights Reserved
 
 import unittest
+from functools import lru_cache
 
 import torch
 from botorch.test_functions.aug_rosenbrock import (
@@ -13,6 +14,12 @@ from botorch.test_functions.aug_rosenbrock import (
 
 
 DIMENSION = 5
+_MAXIMIZER_LIST = GLOBAL_MAXIMIZER * DIMENSION
+
+
+@lru_cache(maxsize=None)
+def _maximizer_tensor(device, dtype):
+    return torch.tensor(_MAXIMIZER_LIST, device=device, dtype=dtype)
 
 
 class TestNegAugRosenbrock(unittest.TestCase):
@@ -45,12 +52,7 @@ class TestNegAugRosenbrock(unittest.TestCase):
     def test_neg_aug_rosenbrock_global_maximum(self, cuda=False):
         device = torch.device("cuda") if cuda else torch.device("cpu")
         for dtype in (torch.float, torch.double):
-            X = torch.tensor(
-                GLOBAL_MAXIMIZER * DIMENSION,
-                device=device,
-                dtype=dtype,
-                requires_grad=True,
-            )
+            X = _maximizer_tensor(device, dtype).clone().requires_grad_(True)
             res = neg_aug_rosenbrock(X)
             self.assertAlmostEqual(res.item(), GLOBAL_MAXIMUM, places=4)
             grad = torch.autograd.grad(res.sum(), X)[0]